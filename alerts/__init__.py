@@ -0,0 +1,6 @@
+"""Alerting module for crypto harvester"""
+
+from .detector import AnomalyDetector
+from .webhook import WebhookNotifier
+
+__all__ = ['AnomalyDetector', 'WebhookNotifier']
@@ -0,0 +1,277 @@
+"""Streaming anomaly detection for price and exchange rate samples"""
+
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class _SeriesState:
+    """Running statistics for a single price series"""
+
+    __slots__ = ('last_value', 'mean', 'var', 'count', 'held', 'active')
+
+    def __init__(self):
+        # Last value accepted as the reference level; flagged moves do not replace it
+        self.last_value = None
+        # (rule, field) pairs that alerted on the previous sample
+        self.active = frozenset()
+        self.reset()
+
+    def reset(self):
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.held = 0
+
+
+class AnomalyDetector:
+    """Flags suspicious ticks using incremental per-series statistics"""
+
+    # Smallest price step CoinGecko reports with precision=5
+    PRICE_TICK = 0.00001
+
+    # Pushed price fields besides USD (checked by _check_sample) that must be above zero
+    SECONDARY_PRICE_FIELDS = ('aud',)
+
+    # Other pushed fields that must be present; zero is a legitimate value for these
+    REQUIRED_FIELDS = ('usd_market_cap', 'usd_24h_vol', 'usd_24h_change')
+
+    def __init__(self):
+        """Initialize anomaly detector with thresholds from environment"""
+        self.configure()
+
+        # One state object per series, e.g. "price:btc" or "rate:eur"
+        self._state: Dict[str, _SeriesState] = {}
+
+    def configure(self) -> None:
+        """
+        (Re)load thresholds from environment, keeping running statistics
+
+        All values are parsed before any is assigned, so an invalid setting
+        raises ValueError and leaves the current thresholds untouched.
+        """
+        thresholds = {
+            "zscore_threshold": float(os.getenv("ALERT_ZSCORE_THRESHOLD", "4.0")),
+            "jump_pct_threshold": float(os.getenv("ALERT_JUMP_PCT", "20")),
+            "stale_seconds": int(os.getenv("ALERT_STALE_SECONDS", "900")),
+            "warmup_samples": int(os.getenv("ALERT_WARMUP_SAMPLES", "10")),
+            "ewma_alpha": float(os.getenv("ALERT_EWMA_ALPHA", "0.05")),
+            # Lower bound on the return standard deviation so flat series do not blow up z-scores
+            "min_return_std": float(os.getenv("ALERT_MIN_RETURN_STD", "0.001")),
+            # After this many held-back cycles in a row a move is accepted as the new level
+            "max_held_cycles": int(os.getenv("ALERT_MAX_HELD_CYCLES", "3")),
+        }
+        for name, value in thresholds.items():
+            setattr(self, name, value)
+
+    def check_prices(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Check crypto price samples and split off suspicious ticks
+
+        Args:
+            data: Raw price data from CoinGecko API
+
+        Returns:
+            Tuple of (clean price data, list of alert events)
+        """
+        now = time.time()
+        clean = {}
+        alerts = []
+
+        for coin_id, coin_data in data.items():
+            state = self._get_state("price", coin_id)
+            coin_alerts = self._check_fields(coin_id, coin_data)
+            coin_alerts.extend(self._check_sample(
+                state, "price", coin_id, coin_data.get('usd'), now,
+                last_updated_at=coin_data.get('last_updated_at'),
+                tick=self.PRICE_TICK
+            ))
+            alerts.extend(self._new_alerts(state, coin_alerts))
+            if not coin_alerts:
+                clean[coin_id] = coin_data
+
+        return clean, alerts
+
+    def check_exchange_rates(self, rates_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Check BTC exchange rate samples and split off suspicious ticks
+
+        Args:
+            rates_data: Exchange rates data from CoinGecko API
+
+        Returns:
+            Tuple of (exchange rates data without flagged currencies, list of alert events)
+        """
+        now = time.time()
+        clean_rates = {}
+        alerts = []
+
+        for currency_code, rate_info in rates_data.get('rates', {}).items():
+            # BTC to BTC is always 1, nothing to learn from it
+            if currency_code == 'btc':
+                clean_rates[currency_code] = rate_info
+                continue
+
+            state = self._get_state("rate", currency_code)
+            rate_alerts = self._check_sample(state, "rate", currency_code, rate_info.get('value'), now)
+            alerts.extend(self._new_alerts(state, rate_alerts))
+            if not rate_alerts:
+                clean_rates[currency_code] = rate_info
+
+        return {**rates_data, 'rates': clean_rates}, alerts
+
+    def _get_state(self, series: str, asset: str) -> _SeriesState:
+        """Return the running state for a series, creating it on first use"""
+        key = f"{series}:{asset}"
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = _SeriesState()
+        return state
+
+    def _new_alerts(self, state: _SeriesState, alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep only alerts whose condition was not already active on the previous sample
+
+        The sample is still held back while a condition lasts; this only stops an
+        ongoing condition from writing an alert row and webhook call every cycle.
+
+        Args:
+            state: Running state of the series
+            alerts: All alerts raised for the current sample
+
+        Returns:
+            Alerts for conditions that have just started
+        """
+        raised = frozenset((alert['rule'], alert['field']) for alert in alerts)
+        new = [alert for alert in alerts if (alert['rule'], alert['field']) not in state.active]
+        state.active = raised
+        return new
+
+    def _check_fields(self, coin_id: str, coin_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Flag pushed price fields that the formatter would otherwise default to 0
+
+        Args:
+            coin_id: Coin id
+            coin_data: Raw price data for the coin
+
+        Returns:
+            List of alert events for missing or zeroed fields
+        """
+        alerts = []
+        for field in self.SECONDARY_PRICE_FIELDS:
+            value = coin_data.get(field)
+            if not value or value <= 0:
+                alerts.append(self._alert("price", coin_id, "zero_value", value, None, None,
+                                          f"{field} is missing or zero", field=field))
+        for field in self.REQUIRED_FIELDS:
+            if coin_data.get(field) is None:
+                alerts.append(self._alert("price", coin_id, "missing_field", None, None, None,
+                                          f"{field} is missing", field=field))
+        return alerts
+
+    def _check_sample(self, state: _SeriesState, series: str, asset: str, value: Optional[float],
+                      now: float, last_updated_at: Optional[int] = None,
+                      tick: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Apply all rules to one sample and update its running statistics
+
+        Jumps and z-scores are measured against the last accepted value, so a
+        single spike does not also flag the return to normal. Moves no larger
+        than one tick are quantization noise and never flagged by those rules.
+        If they hold a series back for more than max_held_cycles in a row, the
+        move is accepted as a new level and the baseline starts over.
+
+        Args:
+            state: Running state of the series
+            series: Series family ("price" or "rate")
+            asset: Coin id or currency code
+            value: Observed value
+            now: Current Unix timestamp
+            last_updated_at: Upstream Unix timestamp of the value, if provided
+            tick: Smallest reportable change of the value (0 if unknown)
+
+        Returns:
+            List of alert events raised for this sample (empty if clean)
+        """
+        alerts = []
+
+        # Rule 1: missing or zeroed values (the formatters default these to 0)
+        if not value or value <= 0:
+            alerts.append(self._alert(series, asset, "zero_value", value, state.last_value, None,
+                                      "value is missing or zero"))
+            return alerts
+
+        # Rule 2: upstream timestamp is older than the staleness window
+        if last_updated_at is not None:
+            age = now - last_updated_at
+            if age > self.stale_seconds:
+                alerts.append(self._alert(series, asset, "stale", value, None, age,
+                                          f"last_updated_at is {int(age)}s old"))
+
+        previous = state.last_value
+        if previous is None:
+            state.last_value = value
+            return alerts
+
+        change = (value - previous) / previous
+        movement_alerts = []
+
+        # More than one tick, with slack for float rounding
+        if abs(value - previous) > tick * 1.5:
+            # Rule 3: percent jump against the previous sample
+            if abs(change) * 100 > self.jump_pct_threshold:
+                movement_alerts.append(self._alert(series, asset, "pct_jump", value, previous, change * 100,
+                                                   f"moved {change * 100:+.2f}% since last sample"))
+
+            # Rule 4: z-score of the return against its exponentially weighted history
+            if state.count >= self.warmup_samples:
+                std = max(math.sqrt(state.var), self.min_return_std, 2 * tick / previous)
+                zscore = (change - state.mean) / std
+                if abs(zscore) > self.zscore_threshold:
+                    movement_alerts.append(self._alert(series, asset, "zscore", value, previous, zscore,
+                                                       f"return z-score {zscore:+.2f}"))
+
+        if movement_alerts:
+            state.held += 1
+            if state.held <= self.max_held_cycles:
+                alerts.extend(movement_alerts)
+            else:
+                # Persistent move: treat it as the new level and relearn the baseline
+                state.last_value = value
+                state.reset()
+            return alerts
+
+        state.held = 0
+        state.last_value = value
+
+        # Only clean returns feed the baseline so outliers do not widen it
+        if not alerts:
+            if state.count == 0:
+                state.mean = change
+            else:
+                diff = change - state.mean
+                incr = self.ewma_alpha * diff
+                state.mean += incr
+                state.var = (1 - self.ewma_alpha) * (state.var + diff * incr)
+            state.count += 1
+
+        return alerts
+
+    def _alert(self, series: str, asset: str, rule: str, value: Optional[float],
+               reference: Optional[float], score: Optional[float], message: str,
+               field: Optional[str] = None) -> Dict[str, Any]:
+        """Build a single alert event"""
+        return {
+            "series": series,
+            "asset": asset,
+            "rule": rule,
+            "field": field,
+            "value": value,
+            "reference_value": reference,
+            "score": score,
+            "message": message,
+            "detected_at": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        }
@@ -0,0 +1,39 @@
+"""Webhook sink for anomaly alerts"""
+
+import os
+import requests
+from typing import Dict, Any, List
+
+
+class WebhookNotifier:
+    """Posts anomaly alerts to an optional webhook endpoint"""
+    
+    def __init__(self):
+        """Initialize webhook notifier with URL from environment"""
+        self.webhook_url = os.getenv("ALERT_WEBHOOK_URL")
+    
+    def send_alerts(self, alerts: List[Dict[str, Any]]) -> bool:
+        """
+        Post alert events to the configured webhook
+        
+        Args:
+            alerts: Alert events produced by the anomaly detector
+            
+        Returns:
+            True if alerts were delivered, False otherwise
+        """
+        if not alerts:
+            return True
+        
+        # Skip if URL is not configured or is placeholder
+        if not self.webhook_url or "paste_your" in self.webhook_url:
+            return False
+        
+        try:
+            response = requests.post(self.webhook_url, json={"alerts": alerts}, timeout=10)
+            response.raise_for_status()
+            print(f"Sent {len(alerts)} alerts to webhook")
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to send alerts to webhook: {e}")
+            return False
@@ -18,7 +18,10 @@ class CoinGeckoClient:
             raise ValueError("CG_KEY environment variable is not set")
         
         self.base_url = "https://api.coingecko.com/api/v3"
-        self.coins = self.DEFAULT_COINS
+        
+        # Optional comma-separated override of the tracked coins
+        coins = os.getenv("CG_COINS")
+        self.coins = [c.strip() for c in coins.split(",") if c.strip()] if coins else self.DEFAULT_COINS
     
     def fetch_prices(self, coins: List[str] = None) -> Dict[str, Any]:
         """
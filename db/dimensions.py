@@ -0,0 +1,96 @@
+"""In-process cache of dimension surrogate keys for normalized storage"""
+
+from typing import Dict, Any, Tuple
+import mysql.connector
+
+
+class DimensionCache:
+    """Maps natural keys (coin id, currency code, company name) to small integer keys"""
+
+    # dimension -> (table, surrogate key column, natural key column, attribute columns)
+    DIMENSIONS = {
+        "coin": ("dim_coins", "coin_key", "coin_id", ("coin_name",)),
+        "currency": ("dim_currencies", "currency_key", "currency_code",
+                     ("currency_name", "currency_type", "unit")),
+        "company": ("dim_companies", "company_key", "company_name",
+                    ("symbol", "country", "data_source")),
+    }
+
+    def __init__(self):
+        """Initialize an empty cache; each dimension is loaded on first use"""
+        # dimension -> natural key -> (surrogate key, attribute values)
+        self._members: Dict[str, Dict[str, Tuple[int, Tuple[Any, ...]]]] = {}
+
+    def resolve(self, connection: mysql.connector.MySQLConnection, dimension: str,
+                members: Dict[str, Tuple[Any, ...]]) -> Dict[str, int]:
+        """
+        Resolve surrogate keys, inserting new members and refreshing changed attributes
+
+        Inserts and updates are committed before returning so the cache never
+        holds keys that a later fact rollback could invalidate.
+
+        Args:
+            connection: Open MySQL connection
+            dimension: Dimension name ("coin", "currency" or "company")
+            members: Natural key -> attribute values for each member in the batch
+
+        Returns:
+            Dictionary mapping natural keys to surrogate keys. Members that
+            could not be resolved are reported and left out.
+        """
+        table, key_column, natural_column, attr_columns = self.DIMENSIONS[dimension]
+        cache = self._members.get(dimension)
+        cursor = connection.cursor()
+
+        try:
+            # Load the whole dimension once; afterwards only new or changed members hit the database
+            if cache is None:
+                cursor.execute(
+                    f"SELECT {key_column}, {natural_column}, {', '.join(attr_columns)} FROM {table}"
+                )
+                cache = self._members[dimension] = {
+                    row[1]: (row[0], tuple(row[2:])) for row in cursor.fetchall()
+                }
+
+            pending = {
+                natural: tuple(attrs) for natural, attrs in members.items()
+                if natural not in cache or cache[natural][1] != tuple(attrs)
+            }
+            if pending:
+                # Each upsert consumes an AUTO_INCREMENT value even when it only updates
+                # attributes. Changes are rare, but the SMALLINT UNSIGNED currency and
+                # company keys stop at 65535, so attributes that flip every fetch would
+                # eventually exhaust them. The row alias form needs MySQL 8.0.19+.
+                columns = (natural_column,) + attr_columns
+                insert_query = f"""
+                    INSERT INTO {table} ({", ".join(columns)})
+                    VALUES ({", ".join(["%s"] * len(columns))}) AS new
+                    ON DUPLICATE KEY UPDATE {", ".join(f"{c} = new.{c}" for c in attr_columns)}
+                """
+                cursor.executemany(
+                    insert_query,
+                    [(natural,) + attrs for natural, attrs in pending.items()]
+                )
+                connection.commit()
+
+                placeholders = ", ".join(["%s"] * len(pending))
+                cursor.execute(
+                    f"SELECT {key_column}, {natural_column} FROM {table} "
+                    f"WHERE {natural_column} IN ({placeholders})",
+                    list(pending)
+                )
+                for key, natural in cursor.fetchall():
+                    if natural in pending:
+                        cache[natural] = (key, pending[natural])
+        finally:
+            cursor.close()
+
+        keys = {natural: cache[natural][0] for natural in members if natural in cache}
+        if len(keys) < len(members):
+            unresolved = [natural for natural in members if natural not in keys]
+            print(f"Could not resolve {len(unresolved)} {dimension} keys, skipping: {unresolved[:5]}")
+        return keys
+
+    def clear(self) -> None:
+        """Drop all cached keys so they are reloaded on next use"""
+        self._members.clear()
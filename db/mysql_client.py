@@ -2,11 +2,14 @@
 
 import json
 import os
+import time
 from typing import Optional, Dict, Any, List
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
 from datetime import datetime
 
+from .dimensions import DimensionCache
+
 
 class MySQLClient:
     """Handles MySQL database operations for crypto price data"""
@@ -18,8 +21,16 @@ class MySQLClient:
             'port': os.getenv("MYSQL_PORT"),
             'database': os.getenv("MYSQL_DATABASE"),
             'user': os.getenv("MYSQL_USER"),
-            'password': os.getenv("MYSQL_PASSWORD")
+            'password': os.getenv("MYSQL_PASSWORD"),
+            # Bound connection attempts so a hung server cannot stall shutdown
+            'connection_timeout': int(os.getenv("MYSQL_CONNECT_TIMEOUT", "5"))
         }
+        
+        # "legacy" writes wide rows, "normalized" writes narrow facts keyed by dimension tables
+        self.storage_mode = os.getenv("STORAGE_MODE", "legacy").lower()
+        if self.storage_mode not in ("legacy", "normalized"):
+            raise ValueError(f"Unsupported STORAGE_MODE: {self.storage_mode}")
+        self.dimensions = DimensionCache()
     
     def _get_connection(self) -> Optional[mysql.connector.MySQLConnection]:
         """
@@ -50,6 +61,9 @@ class MySQLClient:
         Returns:
             True if save successful, False otherwise
         """
+        if self.storage_mode == "normalized":
+            return self._save_crypto_prices_normalized(data)
+        
         connection = self._get_connection()
         if not connection:
             print("Failed to connect to database, skipping save")
@@ -68,7 +82,6 @@ class MySQLClient:
             # Prepare data for insertion
             for coin_id, coin_data in data.items():
                 # Convert Unix timestamp to datetime
-                import time
                 last_updated = datetime.fromtimestamp(
                     coin_data.get('last_updated_at', time.time())
                 )
@@ -99,6 +112,68 @@ class MySQLClient:
                 cursor.close()
                 connection.close()
     
+    def _save_crypto_prices_normalized(self, data: Dict[str, Any]) -> bool:
+        """
+        Save cryptocurrency price data as narrow fact rows keyed by dim_coins
+        
+        Args:
+            data: Dictionary of crypto price data from API
+            
+        Returns:
+            True if save successful, False otherwise
+        """
+        connection = self._get_connection()
+        if not connection:
+            print("Failed to connect to database, skipping save")
+            return False
+        
+        try:
+            cursor = connection.cursor()
+            
+            coin_keys = self.dimensions.resolve(
+                connection, "coin",
+                {coin_id: (coin_id.upper(),) for coin_id in data}
+            )
+            
+            insert_query = """
+                INSERT INTO crypto_prices_compact 
+                (coin_key, price_usd, price_usd_24h_change, 
+                 market_cap_usd, volume_24h_usd, last_updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """
+            
+            now = time.time()
+            values = [
+                (
+                    coin_keys[coin_id],
+                    coin_data.get('usd', 0),
+                    coin_data.get('usd_24h_change', 0),
+                    coin_data.get('usd_market_cap', 0),
+                    coin_data.get('usd_24h_vol', 0),
+                    datetime.fromtimestamp(coin_data.get('last_updated_at', now))
+                )
+                for coin_id, coin_data in data.items()
+                if coin_id in coin_keys
+            ]
+            cursor.executemany(insert_query, values)
+            
+            connection.commit()
+            print(f"Saved {len(values)} crypto prices to database")
+            return True
+            
+        except Error as e:
+            print(f"Error saving to MySQL: {e}")
+            connection.rollback()
+            if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+                # A cached dimension key no longer exists; reload dimensions next time
+                self.dimensions.clear()
+            return False
+            
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+    
     def save_supported_currencies(self, currencies: List[str]) -> bool:
         """
         Save supported currencies list to database
@@ -153,6 +228,9 @@ class MySQLClient:
         Returns:
             True if save successful, False otherwise
         """
+        if self.storage_mode == "normalized":
+            return self._save_btc_exchange_rates_normalized(rates_data)
+        
         connection = self._get_connection()
         if not connection:
             print("Failed to connect to database, skipping save")
@@ -194,6 +272,66 @@ class MySQLClient:
                 cursor.close()
                 connection.close()
     
+    def _save_btc_exchange_rates_normalized(self, rates_data: Dict[str, Any]) -> bool:
+        """
+        Save BTC exchange rates as narrow fact rows keyed by dim_currencies
+        
+        Args:
+            rates_data: Dictionary with exchange rates data
+            
+        Returns:
+            True if save successful, False otherwise
+        """
+        connection = self._get_connection()
+        if not connection:
+            print("Failed to connect to database, skipping save")
+            return False
+        
+        try:
+            cursor = connection.cursor()
+            
+            rates = rates_data.get('rates', {})
+            currency_keys = self.dimensions.resolve(
+                connection, "currency",
+                {
+                    currency_code: (
+                        rate_info.get('name', currency_code),
+                        rate_info.get('type', 'unknown'),
+                        rate_info.get('unit', currency_code)
+                    )
+                    for currency_code, rate_info in rates.items()
+                }
+            )
+            
+            insert_query = """
+                INSERT INTO btc_exchange_rates_compact (currency_key, rate_value)
+                VALUES (%s, %s)
+            """
+            
+            values = [
+                (currency_keys[currency_code], rate_info.get('value', 0))
+                for currency_code, rate_info in rates.items()
+                if currency_code in currency_keys
+            ]
+            cursor.executemany(insert_query, values)
+            
+            connection.commit()
+            print(f"Saved {len(values)} BTC exchange rates to database")
+            return True
+            
+        except Error as e:
+            print(f"Error saving BTC exchange rates: {e}")
+            connection.rollback()
+            if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+                # A cached dimension key no longer exists; reload dimensions next time
+                self.dimensions.clear()
+            return False
+            
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+    
     def save_bitcoin_companies(self, companies_data: Dict[str, Any]) -> bool:
         """
         Save Bitcoin company holdings data to database
@@ -204,6 +342,9 @@ class MySQLClient:
         Returns:
             True if save successful, False otherwise
         """
+        if self.storage_mode == "normalized":
+            return self._save_bitcoin_companies_normalized(companies_data)
+        
         connection = self._get_connection()
         if not connection:
             print("Failed to connect to database, skipping save")
@@ -267,6 +408,161 @@ class MySQLClient:
                 cursor.close()
                 connection.close()
     
+    def _save_bitcoin_companies_normalized(self, companies_data: Dict[str, Any]) -> bool:
+        """
+        Save Bitcoin company holdings as narrow fact rows keyed by dim_companies
+        
+        Args:
+            companies_data: Dictionary with company holdings data
+            
+        Returns:
+            True if save successful, False otherwise
+        """
+        connection = self._get_connection()
+        if not connection:
+            print("Failed to connect to database, skipping save")
+            return False
+        
+        try:
+            cursor = connection.cursor()
+            
+            companies = companies_data.get('companies', [])
+            
+            # Company name is the natural key, so rows without a name or with a
+            # repeated name cannot be stored separately; keep the first and report the rest
+            unique_companies = {}
+            skipped = []
+            for company in companies:
+                name = company.get('name')
+                if not name or name in unique_companies:
+                    skipped.append(name)
+                else:
+                    unique_companies[name] = company
+            if skipped:
+                print(f"Skipping {len(skipped)} Bitcoin companies with missing or duplicate names: {skipped[:5]}")
+            
+            company_keys = self.dimensions.resolve(
+                connection, "company",
+                {
+                    name: (
+                        company.get('symbol', None),
+                        company.get('country', None),
+                        'public_companies'
+                    )
+                    for name, company in unique_companies.items()
+                }
+            )
+            
+            company_insert_query = """
+                INSERT INTO bitcoin_companies_compact 
+                (company_key, total_holdings, total_entry_value_usd, 
+                 total_current_value_usd, percentage_of_total_supply)
+                VALUES (%s, %s, %s, %s, %s)
+            """
+            
+            values = [
+                (
+                    company_keys[name],
+                    company.get('total_holdings', 0),
+                    company.get('total_entry_value_usd', None),
+                    company.get('total_current_value_usd', None),
+                    company.get('percentage_of_total_supply', None)
+                )
+                for name, company in unique_companies.items()
+                if name in company_keys
+            ]
+            cursor.executemany(company_insert_query, values)
+            
+            # Treasury summary is a single row per fetch and is stored as-is
+            summary_insert_query = """
+                INSERT INTO bitcoin_treasury_summary 
+                (total_holdings, total_value_usd, companies_count, 
+                 market_cap_dominance, data_source)
+                VALUES (%s, %s, %s, %s, %s)
+            """
+            
+            summary_values = (
+                companies_data.get('total_holdings_btc', 0),
+                companies_data.get('total_value_usd', None),
+                len(companies),
+                companies_data.get('market_cap_dominance', None),
+                'public_companies'
+            )
+            cursor.execute(summary_insert_query, summary_values)
+            
+            connection.commit()
+            print(f"Saved {len(values)} Bitcoin companies to database")
+            return True
+            
+        except Error as e:
+            print(f"Error saving Bitcoin companies: {e}")
+            connection.rollback()
+            if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+                # A cached dimension key no longer exists; reload dimensions next time
+                self.dimensions.clear()
+            return False
+            
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+    
+    def save_price_alerts(self, alerts: List[Dict[str, Any]]) -> bool:
+        """
+        Save anomaly alert events to database
+        
+        Args:
+            alerts: Alert events produced by the anomaly detector
+            
+        Returns:
+            True if save successful, False otherwise
+        """
+        if not alerts:
+            return True
+        
+        connection = self._get_connection()
+        if not connection:
+            print("Failed to connect to database, skipping save")
+            return False
+        
+        try:
+            cursor = connection.cursor()
+            
+            insert_query = """
+                INSERT INTO price_alerts 
+                (series, asset, rule_name, observed_value, reference_value, 
+                 score, message)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            
+            values = [
+                (
+                    alert['series'],
+                    alert['asset'],
+                    alert['rule'],
+                    alert.get('value'),
+                    alert.get('reference_value'),
+                    alert.get('score'),
+                    alert.get('message')
+                )
+                for alert in alerts
+            ]
+            cursor.executemany(insert_query, values)
+            
+            connection.commit()
+            print(f"Saved {len(alerts)} price alerts to database")
+            return True
+            
+        except Error as e:
+            print(f"Error saving price alerts: {e}")
+            connection.rollback()
+            return False
+            
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+    
     def save_powerbi_log(self, rows: List[Dict], success: bool, 
                         response_code: Optional[int] = None, 
                         error_message: Optional[str] = None) -> None:
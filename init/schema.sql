@@ -104,6 +104,94 @@ CREATE TABLE IF NOT EXISTS bitcoin_treasury_summary (
     INDEX idx_data_source (data_source)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Table to store anomaly alerts raised by the detection stage
+CREATE TABLE IF NOT EXISTS price_alerts (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    series VARCHAR(20) NOT NULL, -- 'price' or 'rate'
+    asset VARCHAR(50) NOT NULL,
+    rule_name VARCHAR(20) NOT NULL, -- 'zero_value', 'stale', 'pct_jump' or 'zscore'
+    observed_value DECIMAL(30, 10),
+    reference_value DECIMAL(30, 10),
+    score DOUBLE,
+    message VARCHAR(255),
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_asset_detected (series, asset, detected_at),
+    INDEX idx_rule_name (rule_name),
+    INDEX idx_detected_at (detected_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Normalized storage (STORAGE_MODE=normalized)
+-- Dimension tables hold each coin, currency and company once; fact tables
+-- reference them by small integer keys so history rows stay narrow.
+-- Natural keys use a binary NO PAD collation so keys match the API values exactly,
+-- including case and trailing spaces.
+CREATE TABLE IF NOT EXISTS dim_coins (
+    coin_key MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    coin_id VARCHAR(50) COLLATE utf8mb4_0900_bin NOT NULL,
+    coin_name VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_coin_id (coin_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS dim_currencies (
+    currency_key SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    currency_code VARCHAR(10) COLLATE utf8mb4_0900_bin NOT NULL,
+    currency_name VARCHAR(100),
+    currency_type VARCHAR(20), -- 'fiat' or 'crypto'
+    unit VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_currency_code (currency_code),
+    INDEX idx_currency_type (currency_type)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS dim_companies (
+    company_key SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    company_name VARCHAR(255) COLLATE utf8mb4_0900_bin NOT NULL,
+    symbol VARCHAR(20),
+    country VARCHAR(100),
+    data_source VARCHAR(50), -- 'public_companies' or 'private_companies'
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_company_name (company_name),
+    INDEX idx_symbol (symbol),
+    INDEX idx_country (country)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Fact tables are clustered on (key, fetched_at) so per-asset history is contiguous.
+-- fetched_at keeps microseconds so separate writes in the same second do not collide.
+CREATE TABLE IF NOT EXISTS crypto_prices_compact (
+    coin_key MEDIUMINT UNSIGNED NOT NULL,
+    fetched_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    price_usd DECIMAL(20, 8) NOT NULL,
+    price_usd_24h_change DECIMAL(10, 4),
+    market_cap_usd DECIMAL(25, 2),
+    volume_24h_usd DECIMAL(25, 2),
+    last_updated_at TIMESTAMP NULL,
+    PRIMARY KEY (coin_key, fetched_at),
+    INDEX idx_fetched_at (fetched_at),
+    FOREIGN KEY (coin_key) REFERENCES dim_coins (coin_key)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS btc_exchange_rates_compact (
+    currency_key SMALLINT UNSIGNED NOT NULL,
+    fetched_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    rate_value DECIMAL(30, 10) NOT NULL,
+    PRIMARY KEY (currency_key, fetched_at),
+    INDEX idx_fetched_at (fetched_at),
+    FOREIGN KEY (currency_key) REFERENCES dim_currencies (currency_key)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS bitcoin_companies_compact (
+    company_key SMALLINT UNSIGNED NOT NULL,
+    fetched_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    total_holdings DECIMAL(20, 8) NOT NULL,
+    total_entry_value_usd DECIMAL(25, 2),
+    total_current_value_usd DECIMAL(25, 2),
+    percentage_of_total_supply DECIMAL(10, 6),
+    PRIMARY KEY (company_key, fetched_at),
+    INDEX idx_fetched_at (fetched_at),
+    FOREIGN KEY (company_key) REFERENCES dim_companies (company_key)
+) ENGINE=InnoDB;
+
 -- Create a view for the latest prices
 CREATE OR REPLACE VIEW latest_crypto_prices AS
 SELECT 
@@ -147,4 +235,97 @@ INNER JOIN (
     SELECT company_name, MAX(fetched_at) as max_fetched_at
     FROM bitcoin_companies
     GROUP BY company_name
-) bc2 ON bc1.company_name = bc2.company_name AND bc1.fetched_at = bc2.max_fetched_at;
\ No newline at end of file
+) bc2 ON bc1.company_name = bc2.company_name AND bc1.fetched_at = bc2.max_fetched_at;
+
+-- Views that join normalized facts back to the wide row shape
+CREATE OR REPLACE VIEW crypto_prices_expanded AS
+SELECT 
+    dc.coin_id,
+    dc.coin_name,
+    f.price_usd,
+    f.price_usd_24h_change,
+    f.market_cap_usd,
+    f.volume_24h_usd,
+    f.last_updated_at,
+    f.fetched_at
+FROM crypto_prices_compact f
+INNER JOIN dim_coins dc ON dc.coin_key = f.coin_key;
+
+CREATE OR REPLACE VIEW btc_exchange_rates_expanded AS
+SELECT 
+    dcur.currency_code,
+    dcur.currency_name,
+    dcur.currency_type,
+    f.rate_value,
+    dcur.unit,
+    f.fetched_at
+FROM btc_exchange_rates_compact f
+INNER JOIN dim_currencies dcur ON dcur.currency_key = f.currency_key;
+
+CREATE OR REPLACE VIEW bitcoin_companies_expanded AS
+SELECT 
+    dco.company_name,
+    dco.symbol,
+    dco.country,
+    f.total_holdings,
+    f.total_entry_value_usd,
+    f.total_current_value_usd,
+    f.percentage_of_total_supply,
+    dco.data_source,
+    f.fetched_at
+FROM bitcoin_companies_compact f
+INNER JOIN dim_companies dco ON dco.company_key = f.company_key;
+
+-- Latest-value views for normalized storage (the latest_* views above read the legacy tables)
+CREATE OR REPLACE VIEW latest_crypto_prices_expanded AS
+SELECT 
+    dc.coin_id,
+    dc.coin_name,
+    f.price_usd,
+    f.price_usd_24h_change,
+    f.market_cap_usd,
+    f.volume_24h_usd,
+    f.last_updated_at,
+    f.fetched_at
+FROM crypto_prices_compact f
+INNER JOIN (
+    SELECT coin_key, MAX(fetched_at) as max_fetched_at
+    FROM crypto_prices_compact
+    GROUP BY coin_key
+) l ON f.coin_key = l.coin_key AND f.fetched_at = l.max_fetched_at
+INNER JOIN dim_coins dc ON dc.coin_key = f.coin_key;
+
+CREATE OR REPLACE VIEW latest_btc_exchange_rates_expanded AS
+SELECT 
+    dcur.currency_code,
+    dcur.currency_name,
+    dcur.currency_type,
+    f.rate_value,
+    dcur.unit,
+    f.fetched_at
+FROM btc_exchange_rates_compact f
+INNER JOIN (
+    SELECT currency_key, MAX(fetched_at) as max_fetched_at
+    FROM btc_exchange_rates_compact
+    GROUP BY currency_key
+) l ON f.currency_key = l.currency_key AND f.fetched_at = l.max_fetched_at
+INNER JOIN dim_currencies dcur ON dcur.currency_key = f.currency_key;
+
+CREATE OR REPLACE VIEW latest_bitcoin_companies_expanded AS
+SELECT 
+    dco.company_name,
+    dco.symbol,
+    dco.country,
+    f.total_holdings,
+    f.total_entry_value_usd,
+    f.total_current_value_usd,
+    f.percentage_of_total_supply,
+    dco.data_source,
+    f.fetched_at
+FROM bitcoin_companies_compact f
+INNER JOIN (
+    SELECT company_key, MAX(fetched_at) as max_fetched_at
+    FROM bitcoin_companies_compact
+    GROUP BY company_key
+) l ON f.company_key = l.company_key AND f.fetched_at = l.max_fetched_at
+INNER JOIN dim_companies dco ON dco.company_key = f.company_key;
\ No newline at end of file
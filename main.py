@@ -1,14 +1,95 @@
 """CoinGecko Crypto Price Harvester - Main Application"""
 
-import time
 from dotenv import load_dotenv
 
 from api import CoinGeckoClient
 from db import MySQLClient
 from streaming import PowerBIClient
+from alerts import AnomalyDetector, WebhookNotifier
+from runtime import RuntimeController
 from config import AppSettings
 
 
+def record_alerts(mysql, notifier, controller, alerts):
+    """Store alerts and post them to the webhook while the drain budget lasts"""
+    mysql.save_price_alerts(alerts)
+    if controller.should_continue():
+        notifier.send_alerts(alerts)
+    else:
+        print(f"Shutdown drain budget spent, not posting {len(alerts)} alerts to webhook")
+
+
+def push_rows(powerbi, mysql, controller, rows, dataset_type):
+    """Push rows to Power BI and log the attempt while the drain budget lasts"""
+    if not controller.should_continue():
+        print(f"Shutdown drain budget spent, skipping Power BI {dataset_type} push")
+        return
+    success, response_code, error_msg = powerbi.push_data(rows, dataset_type)
+    mysql.save_powerbi_log(rows, success, response_code, error_msg)
+
+
+def run_cycle(coingecko, mysql, powerbi, detector, notifier, controller):
+    """
+    Fetch, store and push one round of data
+    
+    On shutdown, database writes for data already fetched always complete.
+    New fetches, webhook posts and Power BI pushes only start while the
+    controller's drain budget lasts, so at most one HTTP call runs past it.
+    """
+    print("\n--- Fetching all data ---")
+    
+    # 1. Fetch and process crypto prices
+    print("Fetching crypto prices...")
+    data = coingecko.fetch_prices()
+    mysql.save_crypto_prices(data)
+    clean_data, price_alerts = detector.check_prices(data)
+    if price_alerts:
+        print(f"Holding back {len(data) - len(clean_data)} suspicious price ticks")
+        record_alerts(mysql, notifier, controller, price_alerts)
+    rows = powerbi.format_rows(clean_data)
+    push_rows(powerbi, mysql, controller, rows, "prices")
+    
+    # 2. Fetch supported currencies
+    if not controller.should_continue():
+        return
+    try:
+        print("Fetching supported currencies...")
+        currencies = coingecko.get_supported_currencies()
+        mysql.save_supported_currencies(currencies)
+    except Exception as e:
+        print(f"Error fetching supported currencies: {e}")
+    
+    # 3. Fetch BTC exchange rates
+    if not controller.should_continue():
+        return
+    try:
+        print("Fetching BTC exchange rates...")
+        exchange_rates = coingecko.get_exchange_rates()
+        mysql.save_btc_exchange_rates(exchange_rates)
+        clean_rates, rate_alerts = detector.check_exchange_rates(exchange_rates)
+        if rate_alerts:
+            record_alerts(mysql, notifier, controller, rate_alerts)
+        exchange_rows = powerbi.format_exchange_rates(clean_rates)
+        if exchange_rows:
+            push_rows(powerbi, mysql, controller, exchange_rows, "exchange_rates")
+    except Exception as e:
+        print(f"Error fetching exchange rates: {e}")
+    
+    # 4. Fetch Bitcoin companies holdings
+    if not controller.should_continue():
+        return
+    try:
+        print("Fetching Bitcoin company holdings...")
+        companies_data = coingecko.get_bitcoin_companies()
+        mysql.save_bitcoin_companies(companies_data)
+        company_rows = powerbi.format_bitcoin_companies(companies_data)
+        if company_rows:
+            push_rows(powerbi, mysql, controller, company_rows, "companies")
+    except Exception as e:
+        print(f"Error fetching Bitcoin companies: {e}")
+    
+    print("All data fetched successfully.")
+
 
 def main():
     """Main application entry point"""
@@ -19,70 +100,52 @@ def main():
     settings = AppSettings.from_env()
     settings.validate()
     
+    # Handle SIGTERM/SIGINT (drain and stop), SIGHUP (reload) and SIGUSR1 (run now)
+    controller = RuntimeController()
+    controller.install()
+    
     # Initialize clients
     coingecko = CoinGeckoClient()
     mysql = MySQLClient()
     powerbi = PowerBIClient()
+    detector = AnomalyDetector()
+    notifier = WebhookNotifier()
     
     print("Starting CoinGecko harvester with MySQL storage...")
     print("Fetching all data every 60 seconds...")
     
     # Wait for MySQL to be ready (useful when starting with docker-compose)
-    time.sleep(settings.startup_delay_seconds)
+    controller.sleep(settings.startup_delay_seconds)
     
-    # Main loop - fetch everything every 60 seconds
-    while True:
-        try:
-            print("\n--- Fetching all data ---")
-            
-            # 1. Fetch and process crypto prices
-            print("Fetching crypto prices...")
-            data = coingecko.fetch_prices()
-            mysql.save_crypto_prices(data)
-            rows = powerbi.format_rows(data)
-            success, response_code, error_msg = powerbi.push_data(rows)
-            mysql.save_powerbi_log(rows, success, response_code, error_msg)
-            
-            # 2. Fetch supported currencies
-            try:
-                print("Fetching supported currencies...")
-                currencies = coingecko.get_supported_currencies()
-                mysql.save_supported_currencies(currencies)
-            except Exception as e:
-                print(f"Error fetching supported currencies: {e}")
-            
-            # 3. Fetch BTC exchange rates
+    # Main loop - fetch everything every 60 seconds until asked to stop
+    while not controller.stopping:
+        if controller.consume_reload():
             try:
-                print("Fetching BTC exchange rates...")
-                exchange_rates = coingecko.get_exchange_rates()
-                mysql.save_btc_exchange_rates(exchange_rates)
-                exchange_rows = powerbi.format_exchange_rates(exchange_rates)
-                if exchange_rows:
-                    success, response_code, error_msg = powerbi.push_data(exchange_rows, "exchange_rates")
-                    mysql.save_powerbi_log(exchange_rows, success, response_code, error_msg)
+                load_dotenv(override=True)
+                new_settings = AppSettings.from_env()
+                new_settings.validate()
+                new_clients = (CoinGeckoClient(), MySQLClient(), PowerBIClient(), WebhookNotifier())
+                
+                # configure() applies all thresholds or none; clients are swapped only after it succeeds
+                detector.configure()
+                settings = new_settings
+                coingecko, mysql, powerbi, notifier = new_clients
+                print(f"Configuration reloaded, tracking {len(coingecko.coins)} coins")
             except Exception as e:
-                print(f"Error fetching exchange rates: {e}")
-            
-            # 4. Fetch Bitcoin companies holdings
-            try:
-                print("Fetching Bitcoin company holdings...")
-                companies_data = coingecko.get_bitcoin_companies()
-                mysql.save_bitcoin_companies(companies_data)
-                company_rows = powerbi.format_bitcoin_companies(companies_data)
-                if company_rows:
-                    success, response_code, error_msg = powerbi.push_data(company_rows, "companies")
-                    mysql.save_powerbi_log(company_rows, success, response_code, error_msg)
-            except Exception as e:
-                print(f"Error fetching Bitcoin companies: {e}")
-            
-            print("All data fetched successfully. Waiting 60 seconds...")
-            
-            # Wait 60 seconds before next fetch
-            time.sleep(60)
-            
+                print(f"Error reloading configuration, keeping previous settings: {e}")
+        
+        try:
+            run_cycle(coingecko, mysql, powerbi, detector, notifier, controller)
         except Exception as e:
             print(f"Error in main loop: {e}")
-            time.sleep(60)
+        
+        if not controller.stopping:
+            print("Waiting 60 seconds...")
+        
+        # Wait 60 seconds before next fetch
+        controller.sleep(60)
+    
+    print(f"Shutdown complete in {controller.shutdown_duration():.1f}s")
 
 
 if __name__ == "__main__":
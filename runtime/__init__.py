@@ -0,0 +1,5 @@
+"""Runtime control module for crypto harvester"""
+
+from .controller import RuntimeController
+
+__all__ = ['RuntimeController']
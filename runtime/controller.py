@@ -0,0 +1,142 @@
+"""Signal-aware control of the harvest loop"""
+
+import os
+import select
+import signal
+import socket
+import time
+from typing import List, Optional
+
+
+class RuntimeController:
+    """Translates process signals into stop, reload and run-now requests"""
+
+    def __init__(self):
+        """Initialize controller with drain timeout from environment"""
+        # Must stay below the container's stop grace period
+        self.drain_timeout_seconds = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "20"))
+
+        # Signal handlers run on the main thread between bytecodes, possibly while it
+        # holds a lock (e.g. inside print). They therefore only set plain flags and
+        # queue messages; the loop is woken through the signal wakeup fd.
+        self._stop = False
+        self._wake = False
+        self._reload = False
+        self._notices: List[str] = []
+        self.shutdown_started_at: Optional[float] = None
+
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+
+    def install(self) -> None:
+        """Register signal handlers (must be called from the main thread)"""
+        signal.set_wakeup_fd(self._wakeup_writer.fileno(), warn_on_full_buffer=False)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._handle_reload)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._handle_run_now)
+
+    def _handle_stop(self, signum, frame) -> None:
+        """Request shutdown; a second stop signal exits immediately"""
+        name = signal.Signals(signum).name
+        if self._stop:
+            raise SystemExit(f"Received {name} again, exiting without draining")
+
+        self.shutdown_started_at = time.monotonic()
+        self._stop = True
+        self._notices.append(f"Received {name}, finishing in-flight work "
+                             f"(up to {self.drain_timeout_seconds:.0f}s)...")
+
+    def _handle_reload(self, signum, frame) -> None:
+        """Request configuration reload; the next cycle starts right after it"""
+        self._reload = True
+        self._notices.append("Received SIGHUP, configuration will be reloaded")
+
+    def _handle_run_now(self, signum, frame) -> None:
+        """Cut the current wait short and start the next cycle immediately"""
+        self._wake = True
+        self._notices.append("Received SIGUSR1, starting next cycle now")
+
+    def _flush_notices(self) -> None:
+        """Print messages queued by signal handlers (outside of handler context)"""
+        while self._notices:
+            print(self._notices.pop(0))
+
+    @property
+    def stopping(self) -> bool:
+        """Whether shutdown has been requested"""
+        return self._stop
+
+    def drain_expired(self) -> bool:
+        """Whether the shutdown drain budget has been used up"""
+        if self.shutdown_started_at is None:
+            return False
+        return time.monotonic() - self.shutdown_started_at >= self.drain_timeout_seconds
+
+    def should_continue(self) -> bool:
+        """
+        Whether the next network call (fetch, webhook post or Power BI push) should start
+
+        Once shutdown is requested, calls keep starting only while the drain
+        budget lasts, so at most one call is still in flight when it runs out.
+
+        Returns:
+            True if another call may start, False otherwise
+        """
+        self._flush_notices()
+        return not self.stopping or not self.drain_expired()
+
+    def consume_reload(self) -> bool:
+        """
+        Check for and clear a pending reload request
+
+        Returns:
+            True if a reload was requested since the last call
+        """
+        self._flush_notices()
+        if self._reload:
+            self._reload = False
+            return True
+        return False
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Wait between cycles, returning early on stop, reload or run-now signals
+
+        Reload and run-now requests received while a cycle was running are kept
+        and end the following wait immediately.
+
+        Args:
+            seconds: Maximum time to wait
+        """
+        # A run-now request that arrived during the last cycle ends this wait at once
+        deadline = time.monotonic() + seconds
+
+        while not (self._stop or self._wake or self._reload):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Any signal writes to the wakeup fd, so select returns right after its handler ran
+            select.select([self._wakeup_reader], [], [], remaining)
+            self._drain_wakeup()
+
+        # Consume the run-now request; any repeat before this point is the same request
+        self._wake = False
+        self._flush_notices()
+
+    def _drain_wakeup(self) -> None:
+        """Discard pending bytes on the signal wakeup socket"""
+        try:
+            while self._wakeup_reader.recv(512):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def shutdown_duration(self) -> float:
+        """Seconds elapsed since shutdown was requested (0 if never requested)"""
+        if self.shutdown_started_at is None:
+            return 0.0
+        return time.monotonic() - self.shutdown_started_at
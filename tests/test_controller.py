@@ -0,0 +1,71 @@
+"""Tests for signal handling in the runtime controller"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from runtime import RuntimeController
+
+
+@pytest.fixture
+def controller():
+    signums = [signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1]
+    previous = {signum: signal.getsignal(signum) for signum in signums}
+    controller = RuntimeController()
+    controller.install()
+    yield controller
+    signal.set_wakeup_fd(-1)
+    for signum, handler in previous.items():
+        signal.signal(signum, handler)
+
+
+def _send_later(signum, delay=0.2):
+    threading.Timer(delay, os.kill, (os.getpid(), signum)).start()
+
+
+def test_run_now_signal_cuts_sleep_short(controller):
+    _send_later(signal.SIGUSR1)
+    started = time.monotonic()
+    controller.sleep(5)
+    assert time.monotonic() - started < 2
+    assert not controller.stopping
+
+
+def test_reload_signal_wakes_sleep_and_is_consumed_once(controller):
+    _send_later(signal.SIGHUP)
+    controller.sleep(5)
+    assert controller.consume_reload()
+    assert not controller.consume_reload()
+
+
+def test_run_now_during_cycle_ends_next_wait_once(controller):
+    os.kill(os.getpid(), signal.SIGUSR1)
+    started = time.monotonic()
+    controller.sleep(5)
+    assert time.monotonic() - started < 1
+
+    # The request was consumed, so the following wait runs its full length
+    started = time.monotonic()
+    controller.sleep(0.3)
+    assert time.monotonic() - started >= 0.25
+
+
+def test_stop_signal_ends_sleep_and_drain_budget_applies(controller):
+    _send_later(signal.SIGTERM)
+    controller.sleep(5)
+    assert controller.stopping
+    assert controller.should_continue()
+
+    controller.drain_timeout_seconds = 0
+    assert not controller.should_continue()
+    assert controller.shutdown_duration() > 0
+
+
+def test_second_stop_signal_exits_immediately(controller):
+    os.kill(os.getpid(), signal.SIGTERM)
+    with pytest.raises(SystemExit):
+        os.kill(os.getpid(), signal.SIGTERM)
+        time.sleep(0.1)
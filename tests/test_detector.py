@@ -0,0 +1,155 @@
+"""Tests for the streaming anomaly detector"""
+
+import time
+
+import pytest
+
+from alerts import AnomalyDetector
+
+
+def _sample(usd, **overrides):
+    """Build a CoinGecko price sample with all pushed fields present"""
+    sample = {
+        "usd": usd,
+        "aud": usd * 1.5,
+        "usd_market_cap": 1000000,
+        "usd_24h_vol": 50000,
+        "usd_24h_change": 0.1,
+        "last_updated_at": time.time(),
+    }
+    sample.update(overrides)
+    return sample
+
+
+def _rules(alerts):
+    return {alert["rule"] for alert in alerts}
+
+
+def test_flat_series_with_tick_moves_is_not_flagged():
+    detector = AnomalyDetector()
+    for _ in range(20):
+        clean, alerts = detector.check_prices({"usdt": _sample(1.0)})
+        assert alerts == []
+
+    for i in range(50):
+        usd = 1.0 + (0.00001 if i % 2 else -0.00001)
+        clean, alerts = detector.check_prices({"usdt": _sample(usd)})
+        assert alerts == [], f"tick {i} flagged: {alerts}"
+        assert "usdt" in clean
+
+
+def test_flat_series_small_moves_stay_under_variance_floor():
+    detector = AnomalyDetector()
+    for _ in range(20):
+        detector.check_prices({"usdc": _sample(1.0)})
+
+    # Three ticks is still far below the minimum return deviation
+    clean, alerts = detector.check_prices({"usdc": _sample(1.00003)})
+    assert alerts == []
+
+
+def test_jump_is_flagged_and_held_back():
+    detector = AnomalyDetector()
+    price = 100.0
+    for i in range(20):
+        price *= 1.002 if i % 2 else 0.998
+        detector.check_prices({"btc": _sample(price)})
+
+    clean, alerts = detector.check_prices({"btc": _sample(price * 1.3)})
+    assert {"pct_jump", "zscore"} <= _rules(alerts)
+    assert "btc" not in clean
+
+
+def test_persistent_move_is_accepted_after_max_held_cycles():
+    detector = AnomalyDetector()
+    price = 100.0
+    for i in range(20):
+        price *= 1.002 if i % 2 else 0.998
+        detector.check_prices({"sol": _sample(price)})
+
+    held = 0
+    for _ in range(detector.max_held_cycles + 1):
+        price *= 1.25
+        clean, alerts = detector.check_prices({"sol": _sample(price)})
+        if "sol" not in clean:
+            held += 1
+    assert held == detector.max_held_cycles
+    assert "sol" in clean
+
+
+def test_spike_then_recovery_only_holds_back_the_spike():
+    detector = AnomalyDetector()
+    price = 100.0
+    for i in range(20):
+        price *= 1.002 if i % 2 else 0.998
+        detector.check_prices({"eth": _sample(price)})
+
+    clean, alerts = detector.check_prices({"eth": _sample(price * 1.5)})
+    assert "eth" not in clean
+    assert "pct_jump" in _rules(alerts)
+
+    clean, alerts = detector.check_prices({"eth": _sample(price * 1.001)})
+    assert alerts == []
+    assert "eth" in clean
+
+
+def test_ongoing_condition_alerts_once_but_stays_held_back():
+    detector = AnomalyDetector()
+    emitted = []
+    for _ in range(5):
+        stale = _sample(2.0, last_updated_at=time.time() - detector.stale_seconds - 60)
+        clean, alerts = detector.check_prices({"xrp": stale})
+        emitted.extend(alerts)
+        assert clean == {}
+    assert _rules(emitted) == {"stale"}
+    assert len(emitted) == 1
+
+    # Recovering and going stale again is a new episode
+    detector.check_prices({"xrp": _sample(2.0)})
+    stale = _sample(2.0, last_updated_at=time.time() - detector.stale_seconds - 60)
+    clean, alerts = detector.check_prices({"xrp": stale})
+    assert _rules(alerts) == {"stale"}
+
+
+def test_new_missing_field_alerts_while_another_is_ongoing():
+    detector = AnomalyDetector()
+    sample = _sample(2.0)
+    del sample["usd_24h_vol"]
+    clean, alerts = detector.check_prices({"avax": sample})
+    assert len(alerts) == 1
+
+    sample = _sample(2.0)
+    del sample["usd_24h_vol"]
+    del sample["usd_market_cap"]
+    clean, alerts = detector.check_prices({"avax": sample})
+    assert [alert["field"] for alert in alerts] == ["usd_market_cap"]
+
+
+def test_zeroed_and_missing_pushed_fields_are_flagged():
+    detector = AnomalyDetector()
+    sample = _sample(2.0, aud=0)
+    del sample["usd_24h_vol"]
+
+    clean, alerts = detector.check_prices({"ada": sample})
+    assert _rules(alerts) == {"zero_value", "missing_field"}
+    assert clean == {}
+
+
+def test_stale_sample_is_flagged():
+    detector = AnomalyDetector()
+    stale = _sample(2.0, last_updated_at=time.time() - detector.stale_seconds - 60)
+
+    clean, alerts = detector.check_prices({"doge": stale})
+    assert _rules(alerts) == {"stale"}
+
+
+def test_invalid_threshold_on_reload_leaves_all_thresholds_unchanged(monkeypatch):
+    detector = AnomalyDetector()
+    before = (detector.zscore_threshold, detector.jump_pct_threshold)
+
+    monkeypatch.setenv("ALERT_ZSCORE_THRESHOLD", "6.0")
+    monkeypatch.setenv("ALERT_JUMP_PCT", "abc")
+    with pytest.raises(ValueError):
+        detector.configure()
+
+    assert (detector.zscore_threshold, detector.jump_pct_threshold) == before
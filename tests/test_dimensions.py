@@ -0,0 +1,122 @@
+"""Tests for the dimension surrogate key cache"""
+
+import re
+
+from db.dimensions import DimensionCache
+
+
+class FakeCursor:
+    """Cursor that runs the cache's SELECT and upsert statements against a dict"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, query, params=None):
+        self.connection.queries.append(query)
+        table = self.connection.table
+        if "WHERE" in query:
+            self._rows = [(table[natural][0], natural) for natural in params if natural in table]
+        else:
+            self._rows = [(key,) + (natural,) + attrs for natural, (key, attrs) in table.items()]
+
+    def executemany(self, query, rows):
+        self.connection.queries.append(query)
+        for natural, *attrs in rows:
+            if natural in self.connection.reject:
+                continue
+            key = self.connection.table.get(natural, (None,))[0] or self.connection.next_key()
+            self.connection.table[natural] = (key, tuple(attrs))
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection holding a single dimension table as natural key -> (key, attributes)"""
+
+    def __init__(self, table=None, reject=()):
+        self.table = dict(table or {})
+        self.reject = set(reject)
+        self.queries = []
+        self.commits = 0
+
+    def next_key(self):
+        return max((key for key, _ in self.table.values()), default=0) + 1
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+def _upserts(connection):
+    return [query for query in connection.queries if "INSERT" in query]
+
+
+def test_dimension_is_loaded_once_on_first_use():
+    connection = FakeConnection({"usd": (1, ("US Dollar", "fiat", "$"))})
+    cache = DimensionCache()
+
+    assert cache.resolve(connection, "currency", {"usd": ("US Dollar", "fiat", "$")}) == {"usd": 1}
+    assert cache.resolve(connection, "currency", {"usd": ("US Dollar", "fiat", "$")}) == {"usd": 1}
+
+    # One full load, nothing inserted and no further queries for known members
+    assert len(connection.queries) == 1
+    assert _upserts(connection) == []
+
+
+def test_new_member_is_inserted_and_committed():
+    connection = FakeConnection({"btc": (1, ("BTC",))})
+    cache = DimensionCache()
+
+    keys = cache.resolve(connection, "coin", {"btc": ("BTC",), "eth": ("ETH",)})
+
+    assert keys == {"btc": 1, "eth": 2}
+    assert connection.table["eth"] == (2, ("ETH",))
+    assert connection.commits == 1
+    assert "AS new" in _upserts(connection)[0]
+
+
+def test_changed_attribute_is_refreshed():
+    connection = FakeConnection({"Strategy": (7, ("MSTR", "US", "public_companies"))})
+    cache = DimensionCache()
+    cache.resolve(connection, "company", {"Strategy": ("MSTR", "US", "public_companies")})
+
+    keys = cache.resolve(connection, "company", {"Strategy": ("MSTR", "CA", "public_companies")})
+
+    assert keys == {"Strategy": 7}
+    assert connection.table["Strategy"] == (7, ("MSTR", "CA", "public_companies"))
+    upsert = _upserts(connection)[0]
+    assert re.search(r"ON DUPLICATE KEY UPDATE .*country = new\.country", upsert)
+
+    # The refreshed attributes are cached, so the next identical batch does not write
+    cache.resolve(connection, "company", {"Strategy": ("MSTR", "CA", "public_companies")})
+    assert len(_upserts(connection)) == 1
+
+
+def test_unresolved_member_is_skipped(capsys):
+    connection = FakeConnection(reject={"ghost "})
+    cache = DimensionCache()
+
+    keys = cache.resolve(connection, "coin", {"sol": ("SOL",), "ghost ": ("GHOST",)})
+
+    assert keys == {"sol": 1}
+    assert "Could not resolve 1 coin keys" in capsys.readouterr().out
+
+
+def test_clear_reloads_dimension_on_next_use():
+    connection = FakeConnection({"btc": (1, ("BTC",))})
+    cache = DimensionCache()
+    cache.resolve(connection, "coin", {"btc": ("BTC",)})
+
+    # Simulate the row being rebuilt with a new key behind the cache's back
+    connection.table["btc"] = (5, ("BTC",))
+    assert cache.resolve(connection, "coin", {"btc": ("BTC",)}) == {"btc": 1}
+
+    cache.clear()
+    assert cache.resolve(connection, "coin", {"btc": ("BTC",)}) == {"btc": 5}